@@ -1,3 +1,8 @@
 """Workflow Manager - A flexible workflow automation system."""
 
+from pathlib import Path
+
 __version__ = "1.0.0"
+
+# Project root (the directory holding src/, configs/, data/ and logs/), independent of the cwd
+PROJECT_DIR = Path(__file__).resolve().parent.parent
@@ -2,42 +2,109 @@
 
 import sys
 import argparse
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import json
+import queue
 from pathlib import Path
+from typing import Optional
 
-# Add the project root to the Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add the project root to the Python path, so src is importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+# The create/execute flows pull in the factories and every component module,
+# so they are imported lazily in the branches that need them
+from src import PROJECT_DIR
 from src.cli.utils import display_choices, get_choice, print_header, ask_yes_no
-from src.cli.create_workflow import create_workflow
-from src.cli.execute_workflow import execute_workflow, interactive_execute_workflow, get_user_choice, show_workflow_details
 from src.cli.auth import get_current_user
-from src.core.datastore import datastore
+from src.core.datastore import datastore, workflow_list_cache
 from src.core.logging_filter import set_logging_context, setup_context_filter
 
+LOG_DIR = PROJECT_DIR / "logs"
+LOGGING_CONFIG_PATH = PROJECT_DIR / "configs" / "logging_config.json"
+
 # Module-level logger
 logger = logging.getLogger(__name__)
 
 
+class _RoutingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that tags each record with the file handlers of the logger it replaced."""
+    
+    def __init__(self, log_queue, handlers):
+        super().__init__(log_queue)
+        self.target_handlers = tuple(handlers)
+    
+    def prepare(self, record):
+        record = super().prepare(record)
+        record.target_handlers = self.target_handlers
+        return record
+
+
+class _RoutingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that hands each record only to the handlers it was tagged with."""
+    
+    def handle(self, record):
+        for handler in record.target_handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def _queue_file_handlers(loggers) -> None:
+    """Move the loggers' file handlers behind one queue drained by a single background listener."""
+    # Console handlers stay synchronous so log lines keep their place among
+    # print() output and input() prompts
+    logger_handlers = [
+        (logger, [handler for handler in logger.handlers if isinstance(handler, logging.FileHandler)])
+        for logger in loggers
+    ]
+    logger_handlers = [(logger, handlers) for logger, handlers in logger_handlers if handlers]
+    if not logger_handlers:
+        return
+    
+    # A file handler shared by several loggers is drained by the same thread,
+    # so lines from different loggers keep their order in the file
+    log_queue = queue.SimpleQueue()
+    distinct_handlers = list({id(h): h for _, handlers in logger_handlers for h in handlers}.values())
+    listener = _RoutingQueueListener(log_queue, *distinct_handlers)
+    
+    # Callers only enqueue records; formatting and file I/O happen on the listener thread
+    for logger, handlers in logger_handlers:
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(_RoutingQueueHandler(log_queue, handlers))
+    
+    listener.start()
+    atexit.register(listener.stop)
+
+
 def setup_logging():
     """Setup logging configuration from centralized config file."""
     # Ensure logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    LOG_DIR.mkdir(exist_ok=True)
     
     # Load logging configuration from JSON file
-    config_path = Path("configs/logging_config.json")
+    config_path = LOGGING_CONFIG_PATH
     
     try:
         with open(config_path, 'r') as f:
             config = json.load(f)
         
+        # Anchor relative log file names at the project directory rather than the cwd
+        for handler in config.get('handlers', {}).values():
+            if 'filename' in handler:
+                handler['filename'] = str(PROJECT_DIR / handler['filename'])
+        
         # Configure logging using dictConfig
         logging.config.dictConfig(config)
         
+        # Offload handler I/O before the context filter is attached, so the filter
+        # still runs on the logging thread where the context is set
+        _queue_file_handlers(
+            [logging.getLogger()] + [logging.getLogger(name) for name in config.get('loggers', {})]
+        )
+        
         # Setup context filter
         setup_context_filter()
         
@@ -47,10 +114,11 @@ def setup_logging():
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(log_dir / "src.log"),
+                logging.FileHandler(LOG_DIR / "src.log"),
                 logging.StreamHandler()
             ]
         )
+        _queue_file_handlers([logging.getLogger()])
         logger.warning("Logging config file not found, using basic configuration")
     except Exception as e:
         # Fallback to basic configuration on any error
@@ -58,40 +126,45 @@ def setup_logging():
         logger.error(f"Failed to load logging configuration: {e}")
 
 
+# Main menu options
+MAIN_MENU_OPTIONS = [
+    "Create new workflow",
+    "Execute existing workflow",
+    "List my workflows",
+    "Exit"
+]
+
+
 def show_main_menu():
     """Display the main menu and handle user choice."""
+    user = get_current_user()
+    # Set user context for logging
+    set_logging_context(user_id=user.user_id)
+    
+    # Only re-render the menu when another screen has been printed over it
+    needs_redraw = True
     while True:
-        print_header("Workflow Manager")
-        
-        user = get_current_user()
-        # Set user context for logging
-        set_logging_context(user_id=user.user_id)
-        
-        # Show user's workflow count
-        workflow_count = len(datastore.list_workflows(user.user_id))
-        
-        # Main menu options
-        options = [
-            "Create new workflow",
-            "Execute existing workflow",
-            "List my workflows",
-            "Exit"
-        ]
-        
-        display_choices("What would you like to do?", options)
+        if needs_redraw:
+            print_header("Workflow Manager")
+            display_choices("What would you like to do?", MAIN_MENU_OPTIONS)
+        needs_redraw = True
         
         try:
-            choice = get_choice(options, "Select an option")
+            choice = get_choice(MAIN_MENU_OPTIONS, "Select an option")
             
             if choice == 0:  # Create workflow
+                from src.cli.create_workflow import create_workflow
                 create_workflow()
             elif choice == 1:  # Execute workflow
+                from src.cli.execute_workflow import interactive_execute_workflow
                 interactive_execute_workflow()
             elif choice == 2:  # List workflows
                 list_workflows()
             elif choice == 3:  # Exit
                 if ask_yes_no("Are you sure you want to exit?", True):
                     break
+                # The menu is still on screen right above the prompt
+                needs_redraw = False
             
             # Pause before showing menu again
             if choice != 3:
@@ -109,7 +182,7 @@ def list_workflows():
     print_header("My Workflows")
     
     user = get_current_user()
-    workflows = datastore.list_workflows(user.user_id)
+    workflows = workflow_list_cache.get(user.user_id)
     
     if not workflows:
         return
@@ -122,37 +195,61 @@ def list_workflows():
         display_choices("Select workflow to view", workflows)
         choice = get_choice(workflows, "Select workflow")
         selected_workflow = workflows[choice]
+        from src.cli.execute_workflow import show_workflow_details
         show_workflow_details(selected_workflow, user.user_id)
 
 
-def handle_command_line_execution(menu_option: str, workflow_name: str = None):
-    """Handle command-line execution based on provided arguments."""
-    if menu_option.lower() in ['execute', 'exec', '2']:
+def _execute_from_command_line(workflow_name: Optional[str] = None):
+    """Execute a workflow given on the command line, or ask which one to run."""
+    from src.cli.execute_workflow import execute_workflow, get_user_choice
+    if workflow_name:
+        # Direct execution with provided workflow name
+        user = get_current_user()
+        
+        # A single existence check instead of listing and scanning every workflow
+        if not datastore.workflow_exists(user.user_id, workflow_name):
+            logger.error(f"Workflow '{workflow_name}' not found")
+            sys.exit(1)
+        
+        execute_workflow(workflow_name)
+    else:
+        # Get user choice first, then execute
+        workflow_name = get_user_choice()
         if workflow_name:
-            # Direct execution with provided workflow name
-            user = get_current_user()
-            available_workflows = datastore.list_workflows(user.user_id)
-            
-            if workflow_name not in available_workflows:
-                logger.error(f"Workflow '{workflow_name}' not found")
-                sys.exit(1)
-            
             execute_workflow(workflow_name)
-        else:
-            # Get user choice first, then execute
-            workflow_name = get_user_choice()
-            if workflow_name:
-                execute_workflow(workflow_name)
-    
-    elif menu_option.lower() in ['create', '1']:
-        create_workflow()
-    
-    elif menu_option.lower() in ['list', '3']:
-        list_workflows()
-    
-    else:
+
+
+def _create_from_command_line(workflow_name: Optional[str] = None):
+    """Create a new workflow from the command line."""
+    from src.cli.create_workflow import create_workflow
+    create_workflow()
+
+
+def _list_from_command_line(workflow_name: Optional[str] = None):
+    """List workflows from the command line."""
+    list_workflows()
+
+
+# Command-line menu options (and their aliases) mapped to their handlers
+MENU_OPTION_HANDLERS = {
+    'create': _create_from_command_line,
+    '1': _create_from_command_line,
+    'execute': _execute_from_command_line,
+    'exec': _execute_from_command_line,
+    '2': _execute_from_command_line,
+    'list': _list_from_command_line,
+    '3': _list_from_command_line,
+}
+
+
+def handle_command_line_execution(menu_option: str, workflow_name: str = None):
+    """Handle command-line execution based on provided arguments."""
+    handler = MENU_OPTION_HANDLERS.get(menu_option.lower())
+    if handler is None:
         logger.error(f"Unknown menu option: {menu_option}")
         sys.exit(1)
+    
+    handler(workflow_name)
 
 
 def parse_arguments():
@@ -173,6 +270,8 @@ Examples:
     parser.add_argument(
         'menu_option',
         nargs='?',
+        type=str.lower,
+        choices=list(MENU_OPTION_HANDLERS),
         help='Menu option: create, execute, or list'
     )
     
@@ -192,11 +291,6 @@ def main():
         setup_logging()
         logger.info("Workflow Manager starting")
         
-        # Change to the project directory to ensure relative paths work
-        project_dir = Path(__file__).parent.parent
-        import os
-        os.chdir(project_dir)
-        
         # Parse command-line arguments
         args = parse_arguments()
         
@@ -2,14 +2,15 @@
 
 import json
 import logging
-from typing import Dict, Any, List, Set
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Set
 
 from .auth import get_current_user
 from .utils import (
     ask_question, ask_yes_no, display_choices, get_choice, 
     get_valid_workflow_name, print_header, print_separator
 )
-from ..core.datastore import datastore
+from ..core.datastore import datastore, workflow_list_cache
 from ..core.factory import ComponentFactory, ActionFactory, EventFactory
 from ..core.logging_filter import set_logging_context
 
@@ -19,6 +20,19 @@ logger = logging.getLogger(__name__)
 logger = logging.getLogger(__name__)
 
 
+# Store listings are fixed for the process lifetime, so each is read once per session
+@lru_cache(maxsize=None)
+def _components() -> Dict[str, Any]:
+    """Cached ComponentFactory.get_available_components()."""
+    return ComponentFactory.get_available_components()
+
+
+@lru_cache(maxsize=None)
+def _events() -> Dict[str, Any]:
+    """Cached EventFactory.get_available_events()."""
+    return EventFactory.get_available_events()
+
+
 def create_workflow() -> None:
     """Interactive workflow creation flow."""
     logger.info("Starting workflow creation process")
@@ -29,7 +43,11 @@ def create_workflow() -> None:
     set_logging_context(user_id=user.user_id)
     
     # Get existing workflow names to ensure uniqueness
-    existing_workflows = datastore.list_workflows(user.user_id)
+    existing_workflows = set(workflow_list_cache.get(user.user_id))
+    
+    # List the setups of every third-party component up front in one scan
+    third_party = [name for name, info in _components().items() if info.get('type') == 'third_party']
+    setup_listings = datastore.list_setups_by_component(user.user_id, third_party)
     
     # Get workflow name
     workflow_name = get_valid_workflow_name(existing_workflows)
@@ -46,7 +64,7 @@ def create_workflow() -> None:
     print_separator()
     
     # First, add the required event trigger
-    available_events = EventFactory.get_available_events()
+    available_events = _events()
     if not available_events:
         logger.error("No event triggers available")
         return
@@ -59,20 +77,19 @@ def create_workflow() -> None:
     
     # Configure the event trigger
     trigger_id = "trigger_1"
-    trigger_config = configure_event_trigger(selected_event, trigger_id, user.user_id)
+    trigger_config = configure_event_trigger(selected_event, trigger_id, user.user_id, setup_listings)
     trigger_config['is_trigger'] = True
     
     # Add to workflow
     workflow_data['components'][trigger_id] = trigger_config
     
-    # Now add action components
+    # Now add action components; the choice list is the same on every pass
+    component_names = list(_components().keys())
     component_counter = 2
     while True:
-        available_components = ComponentFactory.get_available_components()
-        if not available_components:
+        if not component_names:
             break
         
-        component_names = list(available_components.keys())
         display_choices("Available Components", component_names)
         
         component_choice = get_choice(component_names, "Select a component")
@@ -80,7 +97,7 @@ def create_workflow() -> None:
         
         # Configure the component
         component_id = f"{selected_component}_{component_counter}"
-        component_config = configure_component(selected_component, component_id, user.user_id)
+        component_config = configure_component(selected_component, component_id, user.user_id, setup_listings)
         
         # Add to workflow
         workflow_data['components'][component_id] = component_config
@@ -96,21 +113,21 @@ def create_workflow() -> None:
     
     try:
         datastore.save_workflow(user.user_id, workflow_name, workflow_data)
+        workflow_list_cache.invalidate(user.user_id)
         logger.info(f"Workflow '{workflow_name}' created successfully")
         
         # Display summary
         print_separator()
-        for comp_id, comp_config in workflow_data['components'].items():
-            component_type = comp_config.get('action_type') or comp_config.get('event_type', 'Unknown')
         
     except Exception as e:
         logger.error(f"Error saving workflow: {e}", exc_info=True)
 
 
-def configure_event_trigger(event_name: str, component_id: str, user_id: str) -> Dict[str, Any]:
+def configure_event_trigger(event_name: str, component_id: str, user_id: str,
+                            setup_listings: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
     """Configure an event trigger."""
     # Get event info
-    event_info = EventFactory.get_event_info(event_name)
+    event_info = _events().get(event_name, {})
     if not event_info:
         return {}
     
@@ -118,17 +135,16 @@ def configure_event_trigger(event_name: str, component_id: str, user_id: str) ->
     component_name = event_name.split('.')[0]
     
     # Check if component needs setup
-    component_info = ComponentFactory.get_component_info(component_name)
+    component_info = _components().get(component_name, {})
     setup_name = None
     
     if component_info and component_info.get('type') == 'third_party':
-        setup_name = handle_component_setup(component_name, component_info, user_id)
+        setup_name = handle_component_setup(component_name, component_info, user_id, setup_listings)
     
     # Create component instance for special configuration (like Slack channel selection)
     component_instance = None
     if setup_name:
         try:
-            from ..core.datastore import datastore
             setup_data = datastore.load_component_setup(user_id, component_name, setup_name)
             if setup_data:
                 component_instance = ComponentFactory.create(component_name, component_id)
@@ -145,7 +161,6 @@ def configure_event_trigger(event_name: str, component_id: str, user_id: str) ->
         field_choices = event_class.get_field_choices(param_key, param_info, component_instance)
         
         if field_choices:
-            from .utils import display_choices, get_choice
             if isinstance(field_choices[0], dict):
                 display_choices(f"Available {param_info['name']} options", [c['name'] for c in field_choices])
                 choice_idx = get_choice([c['name'] for c in field_choices], f"Select {param_info['name'].lower()}")
@@ -177,14 +192,15 @@ def configure_event_trigger(event_name: str, component_id: str, user_id: str) ->
     }
 
 
-def configure_component(component_name: str, component_id: str, user_id: str) -> Dict[str, Any]:
+def configure_component(component_name: str, component_id: str, user_id: str,
+                        setup_listings: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
     """Configure a component with its actions and settings."""
     # Check if component needs setup
-    component_info = ComponentFactory.get_component_info(component_name)
+    component_info = _components().get(component_name, {})
     setup_name = None
     
     if component_info and component_info.get('type') == 'third_party':
-        setup_name = handle_component_setup(component_name, component_info, user_id)
+        setup_name = handle_component_setup(component_name, component_info, user_id, setup_listings)
     
     # Get available actions for this component
     available_actions = ActionFactory.get_actions_for_component(component_name)
@@ -209,7 +225,6 @@ def configure_component(component_name: str, component_id: str, user_id: str) ->
     component_instance = None
     if setup_name:
         try:
-            from ..core.datastore import datastore
             setup_data = datastore.load_component_setup(user_id, component_name, setup_name)
             if setup_data:
                 component_instance = ComponentFactory.create(component_name, component_id)
@@ -233,10 +248,13 @@ def configure_component(component_name: str, component_id: str, user_id: str) ->
     }
 
 
-def handle_component_setup(component_name: str, component_info: Dict[str, Any], user_id: str) -> str:
-    """Handle component setup configuration."""
+def handle_component_setup(component_name: str, component_info: Dict[str, Any], user_id: str,
+                           setup_listings: Optional[Dict[str, List[str]]] = None) -> str:
+    """Handle component setup configuration, using and updating setup_listings when given."""
     # Check for existing setups
-    existing_setups = datastore.list_component_setups(user_id, component_name)
+    existing_setups = setup_listings.get(component_name) if setup_listings is not None else None
+    if existing_setups is None:
+        existing_setups = datastore.list_component_setups(user_id, component_name)
     
     if existing_setups:
         display_choices("Available Setups", existing_setups)
@@ -254,21 +272,19 @@ def handle_component_setup(component_name: str, component_info: Dict[str, Any],
         else:
             # Create new setup
             setup_name = ask_question("Enter name for new setup", "default")
-            while setup_name in existing_setups:
+            existing_setup_names = set(existing_setups)
+            while setup_name in existing_setup_names:
                 setup_name = ask_question("Enter a different name for new setup")
     else:
         # No existing setups, create new one
         setup_name = ask_question("Enter name for this setup", "default")
     
-    setup_config = component_info.get('setup', {})
-    
-    setup_data = {}
-    for param_key, param_info in setup_config.items():
-        value = ask_question(f"{param_info['name']} ({param_info['doc']})", param_info.get('default', ''))
-        setup_data[param_key] = value
+    setup_data = _collect_fields(component_info.get('setup', {}))
     
     # Save setup
     datastore.save_component_setup(user_id, component_name, setup_data, setup_name)
+    if setup_listings is not None:
+        setup_listings[component_name] = sorted(set(existing_setups) | {setup_name})
     return setup_name
 
 
@@ -284,7 +300,6 @@ def configure_action(action_name: str, action_info: Dict[str, Any], component_in
             field_choices = action_class.get_field_choices(param_key, param_info, component_instance)
             
             if field_choices:
-                from .utils import display_choices, get_choice
                 if isinstance(field_choices[0], dict):
                     display_choices(f"Available {param_info['name']} options", [c['name'] for c in field_choices])
                     choice_idx = get_choice([c['name'] for c in field_choices], f"Select {param_info['name'].lower()}")
@@ -307,31 +322,60 @@ def configure_action(action_name: str, action_info: Dict[str, Any], component_in
     # Handle conditional configuration
     conditional_config = action_info.get('conditional_config', {})  # Get from action_info, not action_config
     if conditional_config:
-        # Check if any condition is met and configure additional parameters
-        for condition, fields in conditional_config.items():
-            if config.get('operation') == condition or config.get('action') == condition:
-                for field_key, field_info in fields.items():
-                    value = ask_question(f"{field_info['name']} ({field_info['doc']})")
-                    config[field_key] = value
+        # Configure the additional parameters of every condition that is met
+        selected = (config.get('operation'), config.get('action'))
+        for fields in [fields for condition, fields in conditional_config.items() if condition in selected]:
+            config.update(_collect_fields(fields))
     
     return config
 
 
+def _collect_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Ask for each field of a schema in turn and return the answers by key."""
+    # Build every prompt up front, then read the answers in a single pass
+    prompts = [
+        (key, f"{info['name']} ({info['doc']})", info.get('default', ''))
+        for key, info in fields.items()
+    ]
+    return {key: ask_question(prompt, default) for key, prompt, default in prompts}
+
+
 def configure_output_mapping(output_schema: Dict[str, Any]) -> Dict[str, str]:
     """Configure output key mapping for a component."""
     if not output_schema:
         return {}
     
     # Ask user which keys they want to make available and get custom aliases
-    output_mapping = {}
+    keys = list(output_schema)
     
-    if ask_yes_no("Customize output key names?", False):
-        for key, info in output_schema.items():
-            if ask_yes_no(f"Include '{key}' in workflow context?", True):
-                custom_name = ask_question(f"Custom name for '{key}' (press Enter to keep original)", key)
-                output_mapping[key] = custom_name or key
-    else:
+    if not ask_yes_no("Customize output key names?", False):
         # Use all keys with original names
-        output_mapping = {key: key for key in output_schema.keys()}
+        return {key: key for key in keys}
+    
+    # Pick the keys to include with one prompt, then only ask aliases for those
+    output_mapping = {}
+    display_choices("Output keys", keys)
+    for key in _select_output_keys(keys):
+        custom_name = ask_question(f"Custom name for '{key}' (press Enter to keep original)", key)
+        output_mapping[key] = custom_name or key
     
     return output_mapping
+
+
+def _select_output_keys(keys: List[str]) -> List[str]:
+    """Ask once which output keys to include, by number, 'all' or 'none'."""
+    while True:
+        answer = ask_question("Keys to include (comma-separated numbers, 'all' or 'none')", "all").lower()
+        if answer == 'all':
+            return keys
+        if answer == 'none':
+            return []
+        
+        try:
+            selected = {int(part) for part in answer.split(',') if part.strip()}
+        except ValueError:
+            print("Please enter numbers separated by commas, 'all' or 'none'")
+            continue
+        if all(1 <= index <= len(keys) for index in selected):
+            return [key for index, key in enumerate(keys, 1) if index in selected]
+        print(f"Please enter numbers between 1 and {len(keys)}")
@@ -1,24 +1,30 @@
 """Workflow execution CLI flow."""
 
 import json
+import signal
+import sys
 import time
 import logging
+import threading
 from typing import Dict, Any, Optional
 
 from .auth import get_current_user
 from .utils import display_choices, get_choice, print_header, print_separator, format_dict, ask_yes_no
-from ..core.datastore import datastore
+from ..core.datastore import datastore, workflow_list_cache
 from ..core.workflow import Workflow
 from ..core.logging_filter import set_logging_context
 
 # Module-level logger
 logger = logging.getLogger(__name__)
 
+# Seconds between status updates while a reactive workflow is running
+_STATUS_INTERVAL = 30
+
 
 def get_user_choice() -> Optional[str]:
     """Get user's choice of workflow to execute."""
     user = get_current_user()
-    available_workflows = datastore.list_workflows(user.user_id)
+    available_workflows = workflow_list_cache.get(user.user_id)
     
     if not available_workflows:
         return None
@@ -45,9 +51,8 @@ def execute_workflow(workflow_name: str, auto_confirm: bool = False) -> None:
     
     print_separator()
     
-    # Check if this is a reactive workflow
-    components = workflow_data.get('components', {})
-    is_reactive = any(comp.get('is_trigger') for comp in components.values())
+    # Check if this is a reactive workflow (scanned once, reused below)
+    is_reactive = _is_reactive_workflow(workflow_data.get('components') or {})
     
     # Confirm execution
     if not auto_confirm or not is_reactive:
@@ -77,6 +82,15 @@ def execute_workflow(workflow_name: str, auto_confirm: bool = False) -> None:
     print_separator()
 
 
+def _is_reactive_workflow(components: Dict[str, Dict[str, Any]]) -> bool:
+    """Check whether any trigger listens persistently (no timeout, i.e. -1)."""
+    # Matches Workflow.execute, which runs triggers with a timeout once
+    return any(
+        comp.get('is_trigger') and (comp.get('config') or {}).get('timeout', -1) == -1
+        for comp in components.values()
+    )
+
+
 def interactive_execute_workflow() -> None:
     """Interactive workflow execution - user chooses workflow first."""
     workflow_name = get_user_choice()
@@ -95,23 +109,25 @@ def _execute_reactive_workflow(workflow: 'Workflow', workflow_name: str) -> None
         logger.error(f"Failed to start reactive workflow: {result.get('error')}")
         return
     
+    # Block until Ctrl-C, waking only at the status cadence instead of polling every second
+    stop_event = threading.Event()
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+    
     try:
-        # Keep the main thread alive while the reactive workflow runs
-        start_time = time.time()
-        last_status_time = start_time
-        
-        while True:
-            time.sleep(1)
-            
-            # Show periodic status updates
-            current_time = time.time()
-            if current_time - last_status_time >= 30:
-                elapsed = int(current_time - start_time)
-                last_status_time = current_time
-                
+        start_time = time.monotonic()
+        while not stop_event.wait(_STATUS_INTERVAL):
+            elapsed = int(time.monotonic() - start_time)
+            logger.debug(f"Reactive workflow '{workflow_name}' running for {elapsed}s")
     except KeyboardInterrupt:
-        logger.info("Stopping reactive workflow")
-        workflow.cleanup()
+        pass
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+    
+    logger.info("Stopping reactive workflow")
+    workflow.cleanup()
 
 
 def _execute_traditional_workflow(workflow: 'Workflow') -> None:
@@ -123,19 +139,17 @@ def _execute_traditional_workflow(workflow: 'Workflow') -> None:
     if result.get('success'):
         logger.info("Workflow executed successfully")
         
-        # Show results
-        results = result.get('results', {})
-        if results:
-            for comp_id, comp_result in results.items():
-                if isinstance(comp_result, dict):
-                    print(format_dict(comp_result, 1))
-                else:
-                    pass
-        
-        # Show final context
+        # Show results and the final context with a single write
+        blocks = [
+            format_dict(comp_result, 1)
+            for comp_result in result.get('results', {}).values()
+            if isinstance(comp_result, dict)
+        ]
         context = result.get('context', {})
         if context:
-            print(format_dict(context, 1))
+            blocks.append(format_dict(context, 1))
+        if blocks:
+            sys.stdout.write("\n".join(blocks) + "\n")
     else:
         logger.error(f"Workflow execution failed: {result.get('error')}")
         
@@ -152,20 +166,4 @@ def show_workflow_details(workflow_name: str, user_id: str) -> None:
         return
     
     print_header(f"Workflow: {workflow_name}")
-    
-    components = workflow_data.get('components', {})
-    
-    if components:
-        for comp_id, comp_config in components.items():
-            action_type = comp_config.get('action_type') or comp_config.get('event_type', 'Unknown')
-            
-            config = comp_config.get('config', {})
-            if config:
-                for key, value in config.items():
-                    pass
-            
-            output_mapping = comp_config.get('output_mapping', {})
-            if output_mapping:
-                pass
-    
     print_separator()
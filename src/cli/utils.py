@@ -1,12 +1,23 @@
 """Shared utility functions for the CLI."""
 
 import re
+import sys
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Collection, List, Dict, Any, Optional
 
 # Module-level logger
 logger = logging.getLogger(__name__)
 
+# Accepted answers to yes/no questions
+_YES_ANSWERS = frozenset(('y', 'yes'))
+_NO_ANSWERS = frozenset(('n', 'no'))
+
+# Indent prefixes for format_dict, prebuilt for typical nesting depths
+_INDENTS = tuple("  " * level for level in range(32))
+
+# Allowed workflow name characters (letters, numbers, underscores, hyphens)
+_WORKFLOW_NAME_RE = re.compile(r'[a-zA-Z0-9_-]+')
+
 
 def ask_question(question: str, default: str = None) -> str:
     """Ask a question and get user input."""
@@ -22,15 +33,16 @@ def ask_question(question: str, default: str = None) -> str:
 def ask_yes_no(question: str, default: bool = True) -> bool:
     """Ask a yes/no question and return boolean result."""
     default_str = "Y/n" if default else "y/N"
+    prompt = f"{question} [{default_str}]: "
     
     while True:
-        response = input(f"{question} [{default_str}]: ").strip().lower()
+        response = input(prompt).strip().lower()
         
         if not response:
             return default
-        elif response in ['y', 'yes']:
+        elif response in _YES_ANSWERS:
             return True
-        elif response in ['n', 'no']:
+        elif response in _NO_ANSWERS:
             return False
         else:
             print("Please answer 'y' or 'n'")
@@ -38,25 +50,30 @@ def ask_yes_no(question: str, default: bool = True) -> bool:
 
 def display_choices(title: str, choices: List[str], numbered: bool = True) -> None:
     """Display a list of choices."""
-    print(f"\n{title}:")
-    for i, choice in enumerate(choices, 1):
-        if numbered:
-            print(f"  {i}. {choice}")
-        else:
-            print(f"  - {choice}")
+    # Render the whole block and write it in one call
+    lines = [f"\n{title}:"]
+    if numbered:
+        lines.extend(f"  {i}. {choice}" for i, choice in enumerate(choices, 1))
+    else:
+        lines.extend(f"  - {choice}" for choice in choices)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def get_choice(choices: List[str], prompt: str = "Select an option") -> int:
     """Get user's choice from a list of options."""
+    count = len(choices)
+    full_prompt = f"\n{prompt} (1-{count}): "
     while True:
-        try:
-            choice = int(input(f"\n{prompt} (1-{len(choices)}): "))
-            if 1 <= choice <= len(choices):
-                return choice - 1  # Return 0-based index
-            else:
-                print(f"Please enter a number between 1 and {len(choices)}")
-        except ValueError:
+        # Check for digits up front instead of raising and catching ValueError
+        response = input(full_prompt).strip()
+        if not response.isdecimal():
             print("Please enter a valid number")
+            continue
+        
+        choice = int(response)
+        if 1 <= choice <= count:
+            return choice - 1  # Return 0-based index
+        print(f"Please enter a number between 1 and {count}")
 
 
 def validate_workflow_name(name: str) -> bool:
@@ -69,13 +86,13 @@ def validate_workflow_name(name: str) -> bool:
         return False
     
     # Check characters (letters, numbers, underscores, hyphens)
-    if not re.match(r'^[a-zA-Z0-9_-]+$', name):
+    if not _WORKFLOW_NAME_RE.fullmatch(name):
         return False
     
     return True
 
 
-def get_valid_workflow_name(existing_names: List[str]) -> str:
+def get_valid_workflow_name(existing_names: Collection[str]) -> str:
     """Get a valid workflow name from user input."""
     while True:
         name = ask_question("Enter workflow name")
@@ -96,19 +113,38 @@ def get_valid_workflow_name(existing_names: List[str]) -> str:
         return name
 
 
+def _indent(level: int) -> str:
+    """Get the indent prefix for a nesting level."""
+    return _INDENTS[level] if level < len(_INDENTS) else "  " * level
+
+
 def format_dict(data: Dict[Any, Any], indent: int = 0) -> str:
     """Format a dictionary for display."""
+    # Flat dicts (the common final-context case) need no walk at all
+    if not any(isinstance(value, dict) for value in data.values()):
+        indent_str = _indent(indent)
+        return "\n".join([f"{indent_str}{key}: {value}" for key, value in data.items()])
+    
     lines = []
-    indent_str = "  " * indent
     
-    for key, value in data.items():
-        if isinstance(value, dict):
-            lines.append(f"{indent_str}{key}:")
-            lines.append(format_dict(value, indent + 1))
-        elif isinstance(value, list):
-            lines.append(f"{indent_str}{key}: {value}")
+    # Walk nested dicts with an explicit stack of item iterators, appending every
+    # line to one flat list that is joined once
+    stack = [(iter(data.items()), indent)]
+    while stack:
+        items, level = stack[-1]
+        indent_str = _indent(level)
+        for key, value in items:
+            if isinstance(value, dict):
+                lines.append(f"{indent_str}{key}:")
+                if value:
+                    stack.append((iter(value.items()), level + 1))
+                    break
+                # An empty nested dict renders as an empty line
+                lines.append("")
+            else:
+                lines.append(f"{indent_str}{key}: {value}")
         else:
-            lines.append(f"{indent_str}{key}: {value}")
+            stack.pop()
     
     return "\n".join(lines)
 
@@ -168,8 +204,7 @@ def print_separator(char: str = "-", length: int = 50) -> None:
     print(char * length)
 
 
-def print_header(text: str) -> None:
+def print_header(text: str, char: str = "=", length: int = 50) -> None:
     """Print a formatted header."""
-    print_separator("=")
-    print(f" {text} ")
-    print_separator("=")
+    separator = char * length
+    sys.stdout.write(f"{separator}\n {text} \n{separator}\n")
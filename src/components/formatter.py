@@ -1,6 +1,6 @@
 """Formatter component for text and number formatting operations."""
 
-import urllib.parse
+from urllib.parse import quote
 import random
 import logging
 from typing import Dict, Any, List
@@ -8,14 +8,49 @@ from typing import Dict, Any, List
 from ..core.component import BaseComponent, BaseAction
 from ..core.context import WorkflowContext
 
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+# Symbols prefixed to amounts for the currencies with dedicated formatting
+_CURRENCY_SYMBOLS = {
+    'USD': '$',
+    'EUR': '€',
+    'GBP': '£',
+}
+
+# Shared generator for random_number; randrange skips randint's extra call layer
+_rng = random.Random()
+
+
+def _urlencode(input_text: str, config: Dict[str, Any]) -> str:
+    """URL-encode the input text."""
+    return quote(input_text)
+
+
+def _replace(input_text: str, config: Dict[str, Any]) -> str:
+    """Replace every occurrence of old_value with new_value."""
+    return input_text.replace(config.get('old_value', ''), config.get('new_value', ''))
+
+
+def _strip_prefix(input_text: str, config: Dict[str, Any]) -> str:
+    """Remove the prefix from the input text if present."""
+    prefix = config.get('prefix', '')
+    if input_text.startswith(prefix):
+        return input_text[len(prefix):]
+    return input_text
+
+
+# Text operations by name, looked up once per execution
+_TEXT_OPERATIONS = {
+    'urlencode': _urlencode,
+    'replace': _replace,
+    'strip_prefix': _strip_prefix,
+}
+
 
 class Formatter(BaseComponent):
     """Component for text and number formatting operations."""
     
-    def __init__(self, component_id: str, config: Dict[str, Any] = None):
-        super().__init__(component_id, config)
-        self.logger = logging.getLogger(__name__)
-    
     def setup(self, setup_config: Dict[str, Any]) -> None:
         """Formatter is a built-in component and doesn't require setup."""
         pass
@@ -29,31 +64,17 @@ class TextAction(BaseAction):
         """Get available choices for a specific field."""
         return field_config.get('choices', [])
     
-    def __init__(self, component: BaseComponent, config: Dict[str, Any] = None):
-        super().__init__(component, config)
-        self.logger = logging.getLogger(__name__)
-    
     def execute(self, context: WorkflowContext) -> Dict[str, Any]:
         """Execute text formatting operation."""
         operation = self.config.get('operation')
         input_text = self.config.get('input', '')
         
-        if operation == 'urlencode':
-            result = urllib.parse.quote(input_text)
-        elif operation == 'replace':
-            old_value = self.config.get('old_value', '')
-            new_value = self.config.get('new_value', '')
-            result = input_text.replace(old_value, new_value)
-        elif operation == 'strip_prefix':
-            prefix = self.config.get('prefix', '')
-            if input_text.startswith(prefix):
-                result = input_text[len(prefix):]
-            else:
-                result = input_text
-        else:
+        text_operation = _TEXT_OPERATIONS.get(operation)
+        if text_operation is None:
             raise ValueError(f"Unknown text operation: {operation}")
+        result = text_operation(input_text, self.config)
 
-        self.logger.info(f"Formatted text '{input_text}' to '{result}' using operation '{operation}'")
+        logger.info(f"Formatted text '{input_text}' to '{result}' using operation '{operation}'")
         return {
             'formatted_text': result,
             'success': True
@@ -70,7 +91,6 @@ class NumberAction(BaseAction):
     
     def __init__(self, component: BaseComponent, config: Dict[str, Any] = None):
         super().__init__(component, config)
-        self.logger = logging.getLogger(__name__)
     
     def execute(self, context: WorkflowContext) -> Dict[str, Any]:
         """Execute number formatting operation."""
@@ -87,14 +107,12 @@ class NumberAction(BaseAction):
                 amount_float = 0.0
             
             # Simple currency formatting
-            if currency.upper() == 'USD':
-                result = f"${amount_float:,.2f}"
-            elif currency.upper() == 'EUR':
-                result = f"€{amount_float:,.2f}"
-            elif currency.upper() == 'GBP':
-                result = f"£{amount_float:,.2f}"
+            currency = currency.upper()
+            symbol = _CURRENCY_SYMBOLS.get(currency)
+            if symbol is not None:
+                result = f"{symbol}{amount_float:,.2f}"
             else:
-                result = f"{amount_float:,.2f} {currency.upper()}"
+                result = f"{amount_float:,.2f} {currency}"
                 
         elif operation == 'random_number':
             min_value = self.config.get('min_value', 0)
@@ -103,9 +121,9 @@ class NumberAction(BaseAction):
             try:
                 min_val = int(min_value)
                 max_val = int(max_value)
-                result = str(random.randint(min_val, max_val))
+                result = str(_rng.randrange(min_val, max_val + 1))
             except (ValueError, TypeError):
-                result = str(random.randint(0, 100))
+                result = str(_rng.randrange(0, 101))
         else:
             raise ValueError(f"Unknown number operation: {operation}")
         
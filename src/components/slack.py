@@ -1,11 +1,12 @@
 """Slack component for Slack integration."""
 
+import hashlib
 import json
 import requests
 import threading
 import time
 import logging
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Tuple
 from queue import Queue, Empty
 
 from ..core.component import BaseComponent, BaseAction, BaseEvent
@@ -16,6 +17,7 @@ try:
     from slack_sdk.socket_mode import SocketModeClient
     from slack_sdk.socket_mode.request import SocketModeRequest
     from slack_sdk.socket_mode.response import SocketModeResponse
+    from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
     SLACK_SDK_AVAILABLE = True
 except ImportError:
     # Create dummy classes for type hints when SDK is not available
@@ -26,6 +28,33 @@ except ImportError:
     SLACK_SDK_AVAILABLE = False
 
 
+# Web API clients by bot token, shared by every Slack component set up with that token
+_web_clients: Dict[str, WebClient] = {}
+_web_clients_lock = threading.Lock()
+
+
+# Times a Web API call rate-limited with HTTP 429 is retried after waiting out
+# Slack's Retry-After; a throttled send blocks its caller for that long
+_RATE_LIMIT_RETRIES = 2
+
+# Successful auth.test results by token digest, as (validated_at, bot user)
+_validated_tokens: Dict[str, Tuple[float, str]] = {}
+
+# Seconds a validated bot token is trusted before auth.test runs again
+_TOKEN_CACHE_TTL = 300
+
+
+def _get_web_client(bot_token: str) -> WebClient:
+    """Get the shared WebClient for a bot token, creating it on first use."""
+    with _web_clients_lock:
+        web_client = _web_clients.get(bot_token)
+        if web_client is None:
+            web_client = WebClient(token=bot_token)
+            web_client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=_RATE_LIMIT_RETRIES))
+            _web_clients[bot_token] = web_client
+        return web_client
+
+
 class Slack(BaseComponent):
     """Component for Slack integration."""
     
@@ -53,7 +82,7 @@ class Slack(BaseComponent):
             raise ValueError("Slack app token is required for Socket Mode")
         
         # Initialize Slack clients with optimized settings for minimal latency
-        self.web_client = WebClient(token=self.bot_token)
+        self.web_client = _get_web_client(self.bot_token)
         self.socket_client = SocketModeClient(
             app_token=self.app_token,
             web_client=self.web_client,
@@ -66,15 +95,27 @@ class Slack(BaseComponent):
             ping_pong_trace_enabled=False,  # Disable ping/pong tracing
         )
         
-        # Test the connection
+        # Test the connection, unless this token passed auth.test recently
+        token_key = hashlib.blake2b(self.bot_token.encode(), digest_size=16).hexdigest()
+        cached = _validated_tokens.get(token_key)
+        if cached is not None and time.monotonic() - cached[0] < _TOKEN_CACHE_TTL:
+            self.logger.debug(f"Slack token recently validated for bot: {cached[1]}")
+            return
+        
         try:
             auth_response = self.web_client.auth_test()
             if not auth_response["ok"]:
                 raise ValueError(f"Slack authentication failed: {auth_response.get('error', 'Unknown error')}")
             
+            _validated_tokens[token_key] = (time.monotonic(), auth_response['user'])
             self.logger.info(f"Slack setup successful for bot: {auth_response['user']}")
         except Exception as e:
             raise ValueError(f"Failed to authenticate with Slack: {str(e)}")
+    
+    @staticmethod
+    def invalidate_token_cache() -> None:
+        """Forget validated tokens so the next setup re-runs auth.test."""
+        _validated_tokens.clear()
 
     def get_channels(self):
         """Get list of available channels."""
@@ -311,6 +352,11 @@ class ReceiveMessageEvent(BaseEvent):
             self.logger.error(f"Error in Slack listener: {str(e)}")
             self.is_listening = False
         finally:
+            # Detach this event's handler so a reused client does not dispatch to it again
+            try:
+                self.component.socket_client.socket_mode_request_listeners.remove(self._handle_message)
+            except ValueError:
+                pass
             try:
                 self.component.socket_client.disconnect()
                 self.logger.info("Disconnected from Slack")
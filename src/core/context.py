@@ -1,68 +1,99 @@
 """Thread-safe context manager for workflow data sharing."""
 
 import threading
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 import re
 
 
+# Matches context placeholders like {{key}}
+_PLACEHOLDER_RE = re.compile(r'\{\{([^}]+)\}\}')
+
+
+def _substitute(text: str, data: Dict[str, Any]) -> str:
+    """Replace each {{key}} in text with its value in data, leaving unknown keys as is."""
+    def replace_placeholder(match):
+        value = data.get(match.group(1))
+        return str(value) if value is not None else match.group(0)
+    
+    return _PLACEHOLDER_RE.sub(replace_placeholder, text)
+
+
 class WorkflowContext:
     """Thread-safe context manager for sharing data between workflow components."""
     
+    __slots__ = ('_data', '_lock')
+    
     def __init__(self):
+        # Copy-on-write: writers swap in a new dict under the lock, so readers can
+        # use whichever snapshot _data points to without locking
         self._data: Dict[str, Any] = {}
         self._lock = threading.Lock()
     
     def set(self, key: str, value: Any) -> None:
         """Set a value in the context."""
         with self._lock:
-            self._data[key] = value
+            data = self._data.copy()
+            data[key] = value
+            self._data = data
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a value from the context."""
-        with self._lock:
-            return self._data.get(key, default)
+        return self._data.get(key, default)
     
     def update(self, data: Dict[str, Any]) -> None:
         """Update multiple values in the context."""
         with self._lock:
-            self._data.update(data)
+            self._data = {**self._data, **data}
+    
+    def snapshot(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values at once, all read from the same version of the context."""
+        data = self._data
+        return {key: data.get(key) for key in keys}
     
     def get_all(self) -> Dict[str, Any]:
         """Get a copy of all context data."""
-        with self._lock:
-            return self._data.copy()
+        return self._data.copy()
     
     def clear(self) -> None:
         """Clear all context data."""
         with self._lock:
-            self._data.clear()
+            self._data = {}
     
     def resolve_placeholders(self, text: str) -> str:
         """Resolve context placeholders in text (e.g., {{key}} -> value)."""
-        if not isinstance(text, str):
+        if not isinstance(text, str) or '{{' not in text:
             return text
         
-        def replace_placeholder(match):
-            key = match.group(1)
-            value = self.get(key)
-            return str(value) if value is not None else match.group(0)
-        
-        with self._lock:
-            return re.sub(r'\{\{([^}]+)\}\}', replace_placeholder, text)
+        # Resolve every placeholder against one consistent snapshot
+        return _substitute(text, self._data)
     
     def resolve_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Resolve placeholders in a configuration dictionary."""
-        resolved = {}
-        for key, value in config.items():
-            if isinstance(value, str):
-                resolved[key] = self.resolve_placeholders(value)
-            elif isinstance(value, dict):
-                resolved[key] = self.resolve_config(value)
-            elif isinstance(value, list):
-                resolved[key] = [
-                    self.resolve_placeholders(item) if isinstance(item, str) else item
-                    for item in value
-                ]
-            else:
-                resolved[key] = value
+        data = self._data
+        # Identical template strings are substituted once and share the result
+        resolved_strings: Dict[str, str] = {}
+        
+        def resolve(text: str) -> str:
+            if '{{' not in text:
+                return text
+            result = resolved_strings.get(text)
+            if result is None:
+                result = resolved_strings[text] = _substitute(text, data)
+            return result
+        
+        # Walk nested dicts with an explicit stack, filling each copy as it is reached
+        resolved: Dict[str, Any] = {}
+        stack = [(config, resolved)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, str):
+                    target[key] = resolve(value)
+                elif isinstance(value, dict):
+                    target[key] = nested = {}
+                    stack.append((value, nested))
+                elif isinstance(value, list):
+                    target[key] = [resolve(item) if isinstance(item, str) else item for item in value]
+                else:
+                    target[key] = value
         return resolved
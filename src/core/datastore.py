@@ -2,128 +2,323 @@
 
 import json
 import os
-from typing import Dict, Any, List, Optional
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
+from .. import PROJECT_DIR
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+# Default storage location in the project directory, independent of the cwd
+DEFAULT_DATA_DIR = PROJECT_DIR / "data"
+
+
+def _dump_json(data: Any, pretty: bool = False) -> bytes:
+    """Serialize data as JSON bytes, compact unless pretty, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
 
 class DataStore:
     """Handles data storage and retrieval for the workflow manager."""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: Union[str, Path] = DEFAULT_DATA_DIR):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
-        # Create subdirectories
-        (self.data_dir / "users").mkdir(exist_ok=True)
-        (self.data_dir / "workflows").mkdir(exist_ok=True)
-        (self.data_dir / "setups").mkdir(exist_ok=True)
+        # Create subdirectories once and keep their paths for per-call lookups
+        self.users_dir = self.data_dir / "users"
+        self.workflows_dir = self.data_dir / "workflows"
+        self.setups_dir = self.data_dir / "setups"
+        self.users_dir.mkdir(exist_ok=True)
+        self.workflows_dir.mkdir(exist_ok=True)
+        self.setups_dir.mkdir(exist_ok=True)
     
     def _get_user_file(self, user_id: str) -> Path:
         """Get the file path for a user's data."""
-        return self.data_dir / "users" / f"{user_id}.json"
+        return self.users_dir / f"{user_id}.json"
     
     def _get_workflow_file(self, user_id: str, workflow_name: str) -> Path:
         """Get the file path for a workflow."""
-        return self.data_dir / "workflows" / f"{user_id}_{workflow_name}.json"
+        return self.workflows_dir / user_id / f"{workflow_name}.json"
+    
+    def _get_legacy_workflow_file(self, user_id: str, workflow_name: str) -> Path:
+        """Get the pre-partitioning flat file path for a workflow, still read as a fallback."""
+        return self.workflows_dir / f"{user_id}_{workflow_name}.json"
+    
+    def _get_index_file(self, user_id: str) -> Path:
+        """Get the file path for a user's workflow index."""
+        return self.workflows_dir / f"_index_{user_id}.json"
     
     def _get_setup_file(self, user_id: str, component_name: str, setup_name: str = "default") -> Path:
         """Get the file path for a component setup."""
-        return self.data_dir / "setups" / f"{user_id}_{component_name}_{setup_name}.json"
+        return self.setups_dir / f"{user_id}_{component_name}_{setup_name}.json"
     
     def _get_setup_dir(self, user_id: str, component_name: str) -> Path:
         """Get the directory path for component setups."""
-        return self.data_dir / "setups"
+        return self.setups_dir
+    
+    def _write_json(self, path: Path, data: Any) -> None:
+        """Atomically write data to a JSON file via a sibling temp file."""
+        # A unique temp name per call, so concurrent saves of one file never share it
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_dump_json(data))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def _read_json(self, path: Path) -> Optional[Any]:
+        """Load a JSON file, or None if it does not exist."""
+        try:
+            return _load_json(path)
+        except FileNotFoundError:
+            return None
     
     def save_user_profile(self, user_id: str, profile: Dict[str, Any]) -> None:
         """Save a user profile."""
         user_file = self._get_user_file(user_id)
-        with open(user_file, 'w') as f:
-            json.dump(profile, f, indent=2)
+        self._write_json(user_file, profile)
     
     def load_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Load a user profile."""
         user_file = self._get_user_file(user_id)
-        if not user_file.exists():
-            return None
-        
-        with open(user_file, 'r') as f:
-            return json.load(f)
+        return self._read_json(user_file)
     
     def save_workflow(self, user_id: str, workflow_name: str, workflow_data: Dict[str, Any]) -> None:
         """Save a workflow definition."""
         workflow_file = self._get_workflow_file(user_id, workflow_name)
-        with open(workflow_file, 'w') as f:
-            json.dump(workflow_data, f, indent=2)
+        workflow_file.parent.mkdir(exist_ok=True)
+        self._write_json(workflow_file, workflow_data)
+        # The per-user copy supersedes any flat file from the old layout
+        self._get_legacy_workflow_file(user_id, workflow_name).unlink(missing_ok=True)
+        self._update_workflow_index(user_id, added=[workflow_name])
+    
+    def save_workflows(self, user_id: str, workflows: Dict[str, Dict[str, Any]]) -> None:
+        """Save several workflow definitions for a user in one call."""
+        user_dir = self.workflows_dir / user_id
+        user_dir.mkdir(exist_ok=True)
+        for workflow_name, workflow_data in workflows.items():
+            workflow_file = user_dir / f"{workflow_name}.json"
+            self._write_json(workflow_file, workflow_data)
+            self._get_legacy_workflow_file(user_id, workflow_name).unlink(missing_ok=True)
+        self._update_workflow_index(user_id, added=workflows)
+    
+    def delete_workflow(self, user_id: str, workflow_name: str) -> bool:
+        """Delete a workflow definition."""
+        deleted = False
+        for workflow_file in (self._get_workflow_file(user_id, workflow_name),
+                              self._get_legacy_workflow_file(user_id, workflow_name)):
+            try:
+                workflow_file.unlink()
+                deleted = True
+            except FileNotFoundError:
+                continue
+        if deleted:
+            self._update_workflow_index(user_id, removed=[workflow_name])
+        return deleted
+    
+    @contextmanager
+    def _locked_index(self, user_id: str) -> Iterator[None]:
+        """Hold an exclusive lock on a user's workflow index, across processes on POSIX."""
+        lock_file = self.workflows_dir / f"_index_{user_id}.lock"
+        with open(lock_file, 'a') as f:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            # Closing the file releases the lock
+            yield
+    
+    def _scan_workflows(self, user_id: str) -> List[str]:
+        """List a user's workflow names from the workflow files on disk, in either layout."""
+        names = set(self._iter_json_names(self.workflows_dir / user_id, ""))
+        # The flat directory holds every user's legacy files, so it is only scanned
+        # when the index is rebuilt; saves and deletes keep the index current after that
+        names.update(self._iter_json_names(self.workflows_dir, f"{user_id}_"))
+        return sorted(names)
+    
+    def _rebuild_workflow_index(self, user_id: str) -> List[str]:
+        """Rebuild a user's workflow index from the workflow files on disk."""
+        names = self._scan_workflows(user_id)
+        self._write_json(self._get_index_file(user_id), names)
+        return names
+    
+    def _read_workflow_index(self, user_id: str) -> Optional[List[str]]:
+        """Read a user's workflow index, or None if it is missing or unreadable."""
+        try:
+            names = self._read_json(self._get_index_file(user_id))
+        except ValueError:
+            # A corrupt index is rebuilt like a missing one
+            return None
+        return names if isinstance(names, list) else None
+    
+    def _update_workflow_index(self, user_id: str, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+        """Add and remove names in a user's workflow index."""
+        with self._locked_index(user_id):
+            # Read the index fresh under the lock, never from a cache, so an update
+            # made within the same mtime tick is not lost
+            names = self._read_workflow_index(user_id)
+            if names is None:
+                # The directory scan already reflects this change
+                self._rebuild_workflow_index(user_id)
+                return
+            
+            updated = set(names)
+            updated.update(added)
+            updated.difference_update(removed)
+            self._write_json(self._get_index_file(user_id), sorted(updated))
     
     def load_workflow(self, user_id: str, workflow_name: str) -> Optional[Dict[str, Any]]:
         """Load a workflow definition."""
         workflow_file = self._get_workflow_file(user_id, workflow_name)
-        if not workflow_file.exists():
+        try:
+            return _load_json(workflow_file)
+        except FileNotFoundError:
+            # Workflows saved before the per-user layout stay in the flat directory
+            return self._read_json(self._get_legacy_workflow_file(user_id, workflow_name))
+    
+    def export_workflow(self, user_id: str, workflow_name: str, pretty: bool = True) -> Optional[str]:
+        """Export a workflow definition as JSON text, indented for reading by default."""
+        workflow_data = self.load_workflow(user_id, workflow_name)
+        if workflow_data is None:
             return None
+        return _dump_json(workflow_data, pretty=pretty).decode()
+    
+    def _iter_json_names(self, directory: Path, prefix: str) -> Iterator[str]:
+        """Yield the names of `<prefix><name>.json` files in a directory, unsorted."""
+        suffix = ".json"
         
-        with open(workflow_file, 'r') as f:
-            return json.load(f)
+        # os.scandir yields bare names, so no Path object is built per entry
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    if filename.startswith(prefix) and filename.endswith(suffix):
+                        yield filename[len(prefix):-len(suffix)]
+        except FileNotFoundError:
+            return
+    
+    def _list_json_names(self, directory: Path, prefix: str) -> List[str]:
+        """List the sorted names of `<prefix><name>.json` files in a directory."""
+        return sorted(self._iter_json_names(directory, prefix))
     
     def list_workflows(self, user_id: str) -> List[str]:
-        """List all workflows for a user."""
-        workflows = []
-        workflow_dir = self.data_dir / "workflows"
-        prefix = f"{user_id}_"
+        """List all workflows for a user from their index, rebuilding it if it is missing or unreadable."""
+        names = self._read_workflow_index(user_id)
+        if names is not None:
+            return names
         
-        for file_path in workflow_dir.glob(f"{prefix}*.json"):
-            workflow_name = file_path.stem[len(prefix):]
-            workflows.append(workflow_name)
-        
-        return sorted(workflows)
+        with self._locked_index(user_id):
+            # Another process may have rebuilt the index while we waited for the lock
+            names = self._read_workflow_index(user_id)
+            if names is None:
+                names = self._rebuild_workflow_index(user_id)
+        return names
     
     def workflow_exists(self, user_id: str, workflow_name: str) -> bool:
         """Check if a workflow exists."""
         workflow_file = self._get_workflow_file(user_id, workflow_name)
-        return workflow_file.exists()
+        return (os.path.lexists(workflow_file)
+                or os.path.lexists(self._get_legacy_workflow_file(user_id, workflow_name)))
     
     def save_component_setup(self, user_id: str, component_name: str, setup_data: Dict[str, Any], setup_name: str = "default") -> None:
         """Save component setup configuration with a name."""
         setup_file = self._get_setup_file(user_id, component_name, setup_name)
-        with open(setup_file, 'w') as f:
-            json.dump(setup_data, f, indent=2)
+        self._write_json(setup_file, setup_data)
     
     def load_component_setup(self, user_id: str, component_name: str, setup_name: str = "default") -> Optional[Dict[str, Any]]:
         """Load component setup configuration by name."""
         setup_file = self._get_setup_file(user_id, component_name, setup_name)
-        if not setup_file.exists():
-            return None
-        
-        with open(setup_file, 'r') as f:
-            return json.load(f)
+        return self._read_json(setup_file)
     
     def has_component_setup(self, user_id: str, component_name: str, setup_name: str = "default") -> bool:
         """Check if component setup exists by name."""
         setup_file = self._get_setup_file(user_id, component_name, setup_name)
-        return setup_file.exists()
+        return os.path.lexists(setup_file)
     
     def list_component_setups(self, user_id: str, component_name: str) -> List[str]:
         """List all setup names for a component."""
-        setup_names = []
         setup_dir = self._get_setup_dir(user_id, component_name)
-        prefix = f"{user_id}_{component_name}_"
-        suffix = ".json"
+        return self._list_json_names(setup_dir, f"{user_id}_{component_name}_")
+    
+    def list_setups_by_component(self, user_id: str, component_names: List[str]) -> Dict[str, List[str]]:
+        """List setup names for several components with a single directory scan."""
+        prefixes = [(component_name, f"{user_id}_{component_name}_") for component_name in component_names]
+        setups: Dict[str, List[str]] = {component_name: [] for component_name in component_names}
         
-        for file_path in setup_dir.glob(f"{prefix}*.json"):
-            filename = file_path.name
-            if filename.startswith(prefix) and filename.endswith(suffix):
-                setup_name = filename[len(prefix):-len(suffix)]
-                setup_names.append(setup_name)
+        for filename in self._iter_json_names(self.setups_dir, ""):
+            for component_name, prefix in prefixes:
+                if filename.startswith(prefix):
+                    setups[component_name].append(filename[len(prefix):])
         
-        return sorted(setup_names)
+        for names in setups.values():
+            names.sort()
+        return setups
     
     def delete_component_setup(self, user_id: str, component_name: str, setup_name: str) -> bool:
         """Delete a component setup configuration."""
         setup_file = self._get_setup_file(user_id, component_name, setup_name)
-        if setup_file.exists():
+        try:
             setup_file.unlink()
-            return True
-        return False
+        except FileNotFoundError:
+            return False
+        return True
+
+
+class WorkflowListCache:
+    """Short-lived per-user cache of workflow listings, invalidated on save."""
+    
+    def __init__(self, store: DataStore, ttl: float = 5.0):
+        self.store = store
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+    
+    def get(self, user_id: str) -> List[str]:
+        """Get a user's workflow names, listing the datastore only when stale."""
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] <= now:
+            entry = (now + self.ttl, self.store.list_workflows(user_id))
+            self._entries[user_id] = entry
+        return list(entry[1])
+    
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop the cached listing for a user, or for all users."""
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
 
 
 # Global datastore instance
 datastore = DataStore()
+
+# Global workflow listing cache over the datastore
+workflow_list_cache = WorkflowListCache(datastore)
@@ -1,14 +1,17 @@
 """Factories for dynamic object creation."""
 
 import json
-from pathlib import Path
 from typing import Dict, Any, Type, Optional
 
+from .. import PROJECT_DIR
 from .component import BaseComponent, BaseAction, BaseEvent
 from ..components.formatter import Formatter, TextAction, NumberAction
 from ..components.webhook import Webhook, GetAction, PostAction
 from ..components.slack import Slack, SendMessageAction, ReceiveMessageEvent
 
+# Store files live in the project's configs/ directory, independent of the cwd
+CONFIG_DIR = PROJECT_DIR / "configs"
+
 
 class ComponentFactory:
     """Factory for creating component instances."""
@@ -22,16 +25,16 @@ class ComponentFactory:
     @classmethod
     def create(cls, component_name: str, config: Dict[str, Any] = None) -> BaseComponent:
         """Create a component instance by name."""
-        if component_name not in cls._components:
+        component_class = cls._components.get(component_name)
+        if component_class is None:
             raise ValueError(f"Unknown component: {component_name}")
         
-        component_class = cls._components[component_name]
         return component_class(component_name, config)
     
     @classmethod
     def get_available_components(cls) -> Dict[str, Any]:
         """Get available components from the components store."""
-        config_path = Path("configs/components_store.json")
+        config_path = CONFIG_DIR / "components_store.json"
         if not config_path.exists():
             return {}
         
@@ -56,13 +59,19 @@ class ActionFactory:
         'slack.send_message': SendMessageAction,
     }
     
+    _store_path = CONFIG_DIR / "action_store.json"
+    
+    # Per-component action listings, valid while the store's mtime is unchanged
+    _actions_by_component: Dict[str, Dict[str, Any]] = {}
+    _actions_store_mtime: Optional[int] = None
+    
     @classmethod
     def create(cls, action_name: str, component: BaseComponent, config: Dict[str, Any] = None) -> BaseAction:
         """Create an action instance by name."""
-        if action_name not in cls._actions:
+        action_class = cls._actions.get(action_name)
+        if action_class is None:
             raise ValueError(f"Unknown action: {action_name}")
         
-        action_class = cls._actions[action_name]
         return action_class(component, config)
     
     @classmethod
@@ -70,15 +79,10 @@ class ActionFactory:
         """Get the action class for a given action name."""
         return cls._actions.get(action_name)
     
-    @classmethod
-    def get_action_class(cls, action_name: str):
-        """Get the action class for a given action name."""
-        return cls._actions.get(action_name)
-    
     @classmethod
     def get_available_actions(cls) -> Dict[str, Any]:
         """Get available actions from the action store."""
-        config_path = Path("configs/action_store.json")
+        config_path = cls._store_path
         if not config_path.exists():
             return {}
         
@@ -88,12 +92,25 @@ class ActionFactory:
     @classmethod
     def get_actions_for_component(cls, component_name: str) -> Dict[str, Any]:
         """Get available actions for a specific component."""
-        all_actions = cls.get_available_actions()
-        component_actions = {}
+        try:
+            store_mtime = cls._store_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        
+        # Drop every cached listing when the action store changes on disk
+        if store_mtime != cls._actions_store_mtime:
+            cls._actions_by_component = {}
+            cls._actions_store_mtime = store_mtime
         
-        for action_name, action_config in all_actions.items():
-            if action_config.get('component') == component_name:
-                component_actions[action_name] = action_config
+        component_actions = cls._actions_by_component.get(component_name)
+        if component_actions is None:
+            all_actions = cls.get_available_actions()
+            component_actions = {
+                action_name: action_config
+                for action_name, action_config in all_actions.items()
+                if action_config.get('component') == component_name
+            }
+            cls._actions_by_component[component_name] = component_actions
         
         return component_actions
 
@@ -108,10 +125,10 @@ class EventFactory:
     @classmethod
     def create(cls, event_name: str, component: BaseComponent, config: Dict[str, Any] = None) -> BaseEvent:
         """Create an event instance by name."""
-        if event_name not in cls._events:
+        event_class = cls._events.get(event_name)
+        if event_class is None:
             raise ValueError(f"Unknown event: {event_name}")
         
-        event_class = cls._events[event_name]
         return event_class(component, config)
     
     @classmethod
@@ -119,15 +136,10 @@ class EventFactory:
         """Get the event class for a given event name."""
         return cls._events.get(event_name)
     
-    @classmethod
-    def get_event_class(cls, event_name: str):
-        """Get the event class for a given event name."""
-        return cls._events.get(event_name)
-    
     @classmethod
     def get_available_events(cls) -> Dict[str, Any]:
         """Get available events from the event store."""
-        config_path = Path("configs/event_store.json")
+        config_path = CONFIG_DIR / "event_store.json"
         if not config_path.exists():
             return {}
         
@@ -1,48 +1,69 @@
 """Custom logging filter to add context information to log records."""
 
 import logging
-import threading
-from typing import Optional, Dict, Any
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Tuple
+
+
+# Default (user, workflow, context_keys) values used outside any workflow
+_DEFAULT_CONTEXT = ('unknown', 'none', '[]')
+_DEFAULT_RECORD_ATTRS = dict(zip(('user', 'workflow', 'context_keys'), _DEFAULT_CONTEXT))
+
+# Per-thread (and per-task) logging context. A new thread starts with an empty
+# context, so it sees the defaults until it sets its own values.
+_log_context: ContextVar[Tuple[str, str, Any]] = ContextVar('log_context', default=_DEFAULT_CONTEXT)
+
+
+class _LazyKeys:
+    """Context keys rendered as a string only when a formatter asks for them."""
+    
+    __slots__ = ('keys', '_text')
+    
+    def __init__(self, keys: list):
+        self.keys = keys
+        self._text = None
+    
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = str(self.keys)
+        return self._text
 
 
 class ContextFilter(logging.Filter):
     """Filter to add user, workflow, and context information to log records."""
     
-    def __init__(self):
-        super().__init__()
-        self._local = threading.local()
-    
     def filter(self, record):
         """Add context information to the log record."""
-        # Get context information from thread-local storage with defaults
-        user = getattr(self._local, 'user', 'unknown')
-        workflow = getattr(self._local, 'workflow', 'none')
-        context_keys = getattr(self._local, 'context_keys', '[]')
+        context = _log_context.get()
         
-        # Always add these fields to the record
-        record.user = user
-        record.workflow = workflow
-        record.context_keys = context_keys
+        # Outside a workflow, fill in the defaults once per record with a single
+        # dict update; the logger and each handler run this filter in turn
+        if context is _DEFAULT_CONTEXT:
+            if 'user' not in record.__dict__:
+                record.__dict__.update(_DEFAULT_RECORD_ATTRS)
+        else:
+            record.user, record.workflow, record.context_keys = context
         
         return True
     
     def set_user(self, user_id: str):
         """Set the current user for this thread."""
-        self._local.user = user_id
+        _, workflow, context_keys = _log_context.get()
+        _log_context.set((user_id, workflow, context_keys))
     
     def set_workflow(self, workflow_name: str):
         """Set the current workflow for this thread."""
-        self._local.workflow = workflow_name
+        user, _, context_keys = _log_context.get()
+        _log_context.set((user, workflow_name, context_keys))
     
     def set_context_keys(self, context_keys: list):
         """Set the current context keys for this thread."""
-        self._local.context_keys = str(context_keys) if context_keys else '[]'
+        user, workflow, _ = _log_context.get()
+        _log_context.set((user, workflow, _LazyKeys(context_keys) if context_keys else '[]'))
     
     def clear_context(self):
         """Clear all context information for this thread."""
-        self._local.user = 'unknown'
-        self._local.workflow = 'none'
-        self._local.context_keys = '[]'
+        _log_context.set(_DEFAULT_CONTEXT)
 
 
 # Global context filter instance
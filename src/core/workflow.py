@@ -1,18 +1,31 @@
 """Workflow and DAG execution engine."""
 
-from typing import Dict, Any, List, Set, Optional
-from collections import defaultdict, deque
+from typing import Dict, Any, List, Tuple, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import logging
+import traceback
 
-from .context import WorkflowContext
+from .context import WorkflowContext, _PLACEHOLDER_RE
 from .factory import ComponentFactory, ActionFactory, EventFactory
 from .datastore import datastore
 from .logging_filter import set_logging_context, clear_logging_context
 
+# Upper bound on components of one DAG level that execute concurrently
+_MAX_PARALLEL_COMPONENTS = 8
+
 
 class Workflow:
     """Workflow execution engine with DAG support."""
     
+    __slots__ = (
+        'workflow_data', 'user_id', 'context', 'logger', 'name', 'components',
+        'dependencies', '_templates', '_producers', '_adj', '_topo_order', '_levels',
+        '_partition', '_third_party', '_instances',
+        '_output_mappings', '_persistent_events',
+    )
+    
     def __init__(self, workflow_data: Dict[str, Any], user_id: str):
         self.workflow_data = workflow_data
         self.user_id = user_id
@@ -34,86 +47,182 @@ class Workflow:
             raise ValueError("Workflow has no components")
         
         self.dependencies = self._build_dependency_graph()
+        
+        # Components needing a stored setup, read from the components store once
+        components_store = ComponentFactory.get_available_components()
+        self._third_party = frozenset(
+            component_id for component_id, component_config in self.components.items()
+            if components_store.get(component_config.get('component'), {}).get('type') == 'third_party'
+        )
+        
+        # Set-up component instances by component id, reused within one execution
+        # (including every trigger fire of a reactive run) and dropped afterwards
+        self._instances: Dict[str, Any] = {}
+        
+        # (result key, context alias) pairs written back after each execution
+        self._output_mappings: Dict[str, Tuple[Tuple[str, str], ...]] = {
+            component_id: tuple(component_config.get('output_mapping', {}).items())
+            for component_id, component_config in self.components.items()
+        }
+        
+        # Listening trigger events by component id, kept so cleanup() can stop them
+        self._persistent_events: Dict[str, Any] = {}
+        
+        # Execution order and its levels, sorted on first execute() and reused afterwards
+        self._topo_order: Optional[List[str]] = None
+        self._levels: List[List[str]] = []
+        # (persistent triggers, one-shot triggers, actions), each in execution order
+        self._partition: Tuple[List[str], List[str], List[str]] = ([], [], [])
     
-    def _build_dependency_graph(self) -> Dict[str, Set[str]]:
+    def _build_dependency_graph(self) -> Dict[str, Tuple[str, ...]]:
         """Build dependency graph from component configurations."""
         dependencies = defaultdict(set)
         
+        # Templated config values split once into alternating literal text and
+        # placeholder names, reused on every execution
+        self._templates: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        
+        # Index output aliases to the components producing them, so each
+        # placeholder resolves to its producers with one lookup
+        self._producers: Dict[str, List[str]] = defaultdict(list)
+        for component_id, component_config in self.components.items():
+            for alias in set(component_config.get('output_mapping', {}).values()):
+                self._producers[alias].append(component_id)
+        
         for component_id, component_config in self.components.items():
             # Check for context placeholders in configuration
             config = component_config.get('config', {})
+            component_templates = {}
             for key, value in config.items():
                 if isinstance(value, str) and '{{' in value and '}}' in value:
-                    # Extract referenced keys
-                    import re
-                    placeholders = re.findall(r'\{\{([^}]+)\}\}', value)
+                    # Extract referenced keys (odd entries of the split template)
+                    template = tuple(_PLACEHOLDER_RE.split(value))
+                    placeholders = template[1::2]
+                    if placeholders:
+                        component_templates[key] = template
                     for placeholder in placeholders:
-                        # Find which component outputs this key (using custom aliases)
-                        for other_id, other_config in self.components.items():
+                        # Depend on every other component that outputs this key
+                        for other_id in self._producers.get(placeholder, ()):
                             if other_id != component_id:
-                                output_mapping = other_config.get('output_mapping', {})
-                                # Check if placeholder matches any custom alias
-                                if placeholder in output_mapping.values():
-                                    dependencies[component_id].add(other_id)
+                                dependencies[component_id].add(other_id)
+            self._templates[component_id] = component_templates
         
-        return dict(dependencies)
+        # The graph is immutable once built, so store plain tuples
+        frozen = {component_id: tuple(deps) for component_id, deps in dependencies.items()}
+        
+        # Forward adjacency (producer -> consumers) for Kahn's algorithm
+        successors = {component_id: [] for component_id in self.components}
+        for component_id, deps in frozen.items():
+            for dep in deps:
+                successors[dep].append(component_id)
+        self._adj: Dict[str, Tuple[str, ...]] = {
+            component_id: tuple(consumers) for component_id, consumers in successors.items()
+        }
+        
+        return frozen
     
-    def _topological_sort(self) -> List[str]:
-        """Perform topological sort to determine execution order."""
-        # Kahn's algorithm
-        in_degree = defaultdict(int)
+    def _topological_levels(self) -> List[List[str]]:
+        """Group components into levels that only depend on earlier levels."""
+        # Kahn's algorithm over the precomputed forward adjacency, O(V + E);
+        # each wave of components whose in-degree reaches zero forms a level
+        in_degree = {component_id: 0 for component_id in self.components}
         
         # Calculate in-degrees
-        for component_id in self.components:
-            in_degree[component_id] = 0
-        
         for component_id, deps in self.dependencies.items():
             in_degree[component_id] = len(deps)
         
-        # Queue for components with no dependencies
-        queue = deque([comp_id for comp_id, degree in in_degree.items() if degree == 0])
-        result = []
+        # First level: components with no dependencies
+        level = [comp_id for comp_id, degree in in_degree.items() if degree == 0]
+        levels = []
+        visited = 0
         
-        while queue:
-            current = queue.popleft()
-            result.append(current)
+        while level:
+            levels.append(level)
+            visited += len(level)
             
             # Update in-degrees for dependent components
-            for component_id, deps in self.dependencies.items():
-                if current in deps:
-                    in_degree[component_id] -= 1
-                    if in_degree[component_id] == 0:
-                        queue.append(component_id)
+            next_level = []
+            for current in level:
+                for successor in self._adj[current]:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        next_level.append(successor)
+            level = next_level
         
         # Check for cycles
-        if len(result) != len(self.components):
+        if visited != len(in_degree):
             raise ValueError("Circular dependency detected in workflow")
         
-        return result
+        return levels
+    
+    def _topological_sort(self) -> List[str]:
+        """Perform topological sort to determine execution order."""
+        return [component_id for level in self._topological_levels() for component_id in level]
+    
+    def _partition_components(self, execution_order: List[str]) -> Tuple[List[str], List[str], List[str]]:
+        """Split components into persistent triggers, one-shot triggers and actions."""
+        persistent_triggers, one_shot_triggers, action_components = [], [], []
+        for component_id in execution_order:
+            component_config = self.components[component_id]
+            if component_config.get('is_trigger', False):
+                # A trigger is persistent when it has no timeout or timeout = -1
+                if component_config.get('config', {}).get('timeout', -1) == -1:
+                    persistent_triggers.append(component_id)
+                else:
+                    one_shot_triggers.append(component_id)
+            else:
+                action_components.append(component_id)
+        return persistent_triggers, one_shot_triggers, action_components
+    
+    def _execute_level(self, level: List[str]) -> Dict[str, Any]:
+        """Execute one DAG level, running its independent components concurrently."""
+        if len(level) == 1:
+            component_id = level[0]
+            return {component_id: self._execute_component(component_id, self.components[component_id])}
+        
+        # Each task runs in a copy of the caller's context so logging context carries over
+        with ThreadPoolExecutor(max_workers=min(len(level), _MAX_PARALLEL_COMPONENTS)) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._execute_component,
+                                component_id, self.components[component_id], False)
+                for component_id in level
+            ]
+            results = {component_id: future.result() for component_id, future in zip(level, futures)}
+        
+        # Commit outputs on this thread in level order, so components sharing an
+        # alias resolve the same way on every run
+        for component_id in level:
+            self._store_outputs(component_id, results[component_id])
+        return results
     
     def _create_component_instance(self, component_id: str, component_config: Dict[str, Any]):
-        """Create and setup a component instance."""
+        """Create and setup a component instance, reusing it within the current execution."""
+        component = self._instances.get(component_id)
+        if component is not None:
+            return component
+        
         component_name = component_config['component']
         
         # Create component
         component = ComponentFactory.create(component_name)
         
         # Load and apply setup if it's a third-party component
-        components_store = ComponentFactory.get_available_components()
-        if components_store.get(component_name, {}).get('type') == 'third_party':
+        if component_id in self._third_party:
             setup_name = component_config.get('setup_name', 'default')
             setup_data = datastore.load_component_setup(self.user_id, component_name, setup_name)
             if setup_data:
                 component.setup(setup_data)
         
-        return component
+        # Concurrent first uses may both build one; keep whichever was stored first
+        return self._instances.setdefault(component_id, component)
     
-    def _execute_component(self, component_id: str, component_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a single component."""
+    def _execute_component(self, component_id: str, component_config: Dict[str, Any],
+                           store_outputs: bool = True) -> Dict[str, Any]:
+        """Execute a single component, storing its mapped outputs unless told not to."""
         # Update logging context with current context keys
         set_logging_context(context_keys=list(self.context.get_all().keys()))
         
-        self.logger.info(f"Executing component: {component_id}")
+        self.logger.debug(f"Executing component: {component_id}")
         
         try:
             # Create component instance
@@ -122,23 +231,32 @@ class Workflow:
             # Resolve configuration with context (lock-free for reactive workflows)
             try:
                 config = component_config.get('config', {})
-                resolved_config = {}
+                config_templates = self._templates.get(component_id)
                 
-                # Manual resolution to avoid threading lock issues
-                for key, value in config.items():
-                    if isinstance(value, str) and '{{' in value and '}}' in value:
-                        # Extract placeholder
-                        import re
-                        placeholders = re.findall(r'\{\{([^}]+)\}\}', value)
-                        resolved_value = value
-                        for placeholder in placeholders:
-                            # Get value directly without lock
-                            context_value = self.context._data.get(placeholder)
-                            if context_value is not None:
-                                resolved_value = resolved_value.replace(f'{{{{{placeholder}}}}}', str(context_value))
-                        resolved_config[key] = resolved_value
-                    else:
-                        resolved_config[key] = value
+                if not config_templates:
+                    # No templated values, so the config is used as-is
+                    resolved_config = dict(config)
+                else:
+                    resolved_config = {}
+                    
+                    # Read every placeholder from one consistent view of the context
+                    values = self.context.snapshot(
+                        name for template in config_templates.values() for name in template[1::2]
+                    )
+                    for key, value in config.items():
+                        template = config_templates.get(key)
+                        if template:
+                            # Fill placeholder slots and join once; unknown keys stay as-is
+                            parts = list(template)
+                            for i in range(1, len(parts), 2):
+                                context_value = values[parts[i]]
+                                if context_value is None:
+                                    parts[i] = f'{{{{{parts[i]}}}}}'
+                                else:
+                                    parts[i] = str(context_value)
+                            resolved_config[key] = ''.join(parts)
+                        else:
+                            resolved_config[key] = value
                         
             except Exception as e:
                 self.logger.error(f"Config resolution failed for {component_id}: {str(e)}")
@@ -168,82 +286,78 @@ class Workflow:
                 # This might be a legacy component (for backward compatibility)
                 result = {'success': True, 'message': 'Component executed successfully'}
             
-            # Store output in context using custom aliases
-            output_mapping = component_config.get('output_mapping', {})
-            for original_key, custom_key in output_mapping.items():
-                if original_key in result:
-                    self.context.set(custom_key, result[original_key])
+            # Store output in context using custom aliases, in one context update
+            if store_outputs:
+                self._store_outputs(component_id, result)
             
-            self.logger.info(f"Component {component_id} executed successfully")
+            self.logger.debug(f"Component {component_id} executed successfully")
             return result
             
         except Exception as e:
             self.logger.error(f"Error executing component {component_id}: {str(e)}")
             raise
     
+    def _store_outputs(self, component_id: str, result: Dict[str, Any]) -> None:
+        """Copy a component's mapped result keys into the context under their aliases."""
+        outputs = {
+            custom_key: result[original_key]
+            for original_key, custom_key in self._output_mappings[component_id]
+            if original_key in result
+        }
+        if outputs:
+            self.context.update(outputs)
+    
     def cleanup(self) -> None:
         """Clean up any persistent listeners or resources."""
         self.logger.info("Cleaning up workflow resources...")
         
-        for component_id, component_config in self.components.items():
-            event_type = component_config.get('event_type')
-            if event_type and component_config.get('is_trigger', False):
-                try:
-                    # Create component instance to access the event
-                    component = self._create_component_instance(component_id, component_config)
-                    resolved_config = self.context.resolve_config(component_config.get('config', {}))
-                    event = EventFactory.create(event_type, component, resolved_config)
+        # Stop the listeners started by _execute_reactive_workflow
+        for component_id, event in self._persistent_events.items():
+            try:
+                if hasattr(event, 'stop_listening'):
+                    event.stop_listening()
+                    self.logger.info(f"Stopped persistent listener for {component_id}")
                     
-                    # Stop persistent listeners
-                    if hasattr(event, 'stop_listening'):
-                        event.stop_listening()
-                        self.logger.info(f"Stopped persistent listener for {component_id}")
-                        
-                except Exception as e:
-                    self.logger.error(f"Error cleaning up component {component_id}: {str(e)}")
+            except Exception as e:
+                self.logger.error(f"Error cleaning up component {component_id}: {str(e)}")
+        self._persistent_events.clear()
+        
+        # The next execution sets components up again, picking up any changed setups
+        self._instances.clear()
     
     def execute(self) -> Dict[str, Any]:
         """Execute the entire workflow."""
         self.logger.info(f"Starting workflow execution: {self.name}")
         
+        # Components are set up afresh for every execution
+        self._instances.clear()
+        
         try:
-            # Get execution order
-            execution_order = self._topological_sort()
-            
-            # Check if we have persistent event triggers
-            persistent_triggers = []
-            action_components = []
+            # Get execution order; the DAG is fixed after __init__, so sort once
+            if self._topo_order is None:
+                self._levels = self._topological_levels()
+                self._topo_order = [component_id for level in self._levels for component_id in level]
+                self._partition = self._partition_components(self._topo_order)
+            persistent_triggers, one_shot_triggers, action_components = self._partition
             
-            for component_id in execution_order:
-                component_config = self.components[component_id]
-                if component_config.get('is_trigger', False):
-                    # Check if it's a persistent event (no timeout or timeout = -1)
-                    event_config = component_config.get('config', {})
-                    timeout = event_config.get('timeout', -1)
-                    if timeout == -1:
-                        persistent_triggers.append(component_id)
-                    else:
-                        # Non-persistent trigger, execute once
-                        result = self._execute_component(component_id, component_config)
-                        if not result.get('success', False):
-                            return {
-                                'success': False,
-                                'error': f"Trigger {component_id} failed: {result.get('error', 'Unknown error')}",
-                                'context': self.context.get_all()
-                            }
-                else:
-                    action_components.append(component_id)
+            # Non-persistent triggers execute once, before anything else
+            for component_id in one_shot_triggers:
+                result = self._execute_component(component_id, self.components[component_id])
+                if not result.get('success', False):
+                    return {
+                        'success': False,
+                        'error': f"Trigger {component_id} failed: {result.get('error', 'Unknown error')}",
+                        'context': self.context.get_all()
+                    }
             
             # Handle persistent triggers with reactive execution
             if persistent_triggers:
                 return self._execute_reactive_workflow(persistent_triggers, action_components)
             else:
-                # Execute all components once (traditional workflow)
+                # Execute all components once (traditional workflow), level by level
                 results = {}
-                for component_id in execution_order:
-                    component_config = self.components[component_id]
-                    result = self._execute_component(component_id, component_config)
-                    results[component_id] = result
+                for level in self._levels:
+                    results.update(self._execute_level(level))
                 
                 self.logger.info(f"Workflow {self.name} completed successfully")
                 return {
@@ -254,7 +368,6 @@ class Workflow:
             
         except Exception as e:
             self.logger.error(f"Workflow {self.name} failed: {str(e)}")
-            import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             return {
                 'success': False,
@@ -266,45 +379,65 @@ class Workflow:
         """Execute workflow with reactive persistent event triggers."""
         self.logger.info(f"Starting reactive workflow with triggers: {persistent_triggers}")
         
+        # Actions grouped by DAG level; each trigger fire runs a level's actions concurrently
+        action_set = set(action_components)
+        action_levels = [
+            level for level in (
+                [component_id for component_id in level if component_id in action_set]
+                for level in self._levels
+            ) if level
+        ]
+        
         # Set up persistent event listeners with callbacks
         for trigger_id in persistent_triggers:
             component_config = self.components[trigger_id]
             
             # Set up callback for reactive execution BEFORE creating the event
-            def create_callback(trigger_id, trigger_config, action_components):
+            def create_callback(trigger_id, action_levels):
+                def run_action(component_id, store_outputs=True):
+                    component_config = self.components[component_id]
+                    try:
+                        result = self._execute_component(component_id, component_config, store_outputs)
+                        success = result.get('success', False)
+                        if not success:
+                            self.logger.error(f"Action component {component_id} failed: {result.get('error', 'Unknown error')}")
+                        return result
+                    except Exception as e:
+                        self.logger.error(f"Action component {component_id} failed with exception: {str(e)}")
+                        self.logger.error(f"Traceback: {traceback.format_exc()}")
+                        return None
+                
                 def workflow_callback(message_data):
                     self.logger.info(f"Trigger {trigger_id} fired! Executing action components...")
                     
                     # Update context with trigger data
-                    output_mapping = trigger_config.get('output_mapping', {})
-                    for original_key, custom_key in output_mapping.items():
-                        if original_key in message_data:
-                            self.context.set(custom_key, message_data[original_key])
+                    self._store_outputs(trigger_id, message_data)
                     
-                    # Execute all action components using proper workflow execution
-                    for component_id in action_components:
-                        component_config = self.components[component_id]
-                        try:
-                            result = self._execute_component(component_id, component_config)
-                            success = result.get('success', False)
-                            if not success:
-                                self.logger.error(f"Action component {component_id} failed: {result.get('error', 'Unknown error')}")
-                        except Exception as e:
-                            self.logger.error(f"Action component {component_id} failed with exception: {str(e)}")
-                            import traceback
-                            self.logger.error(f"Traceback: {traceback.format_exc()}")
+                    # Execute action components level by level; a level's actions are independent
+                    for level in action_levels:
+                        if len(level) == 1:
+                            run_action(level[0])
+                            continue
+                        with ThreadPoolExecutor(max_workers=min(len(level), _MAX_PARALLEL_COMPONENTS)) as executor:
+                            futures = [
+                                executor.submit(contextvars.copy_context().run, run_action, component_id, False)
+                                for component_id in level
+                            ]
+                        # Commit the level's outputs in level order once every action has finished
+                        for component_id, future in zip(level, futures):
+                            result = future.result()
+                            if result is not None:
+                                self._store_outputs(component_id, result)
                     self.logger.info(f"Workflow cycle completed for trigger {trigger_id}")
                 
                 return workflow_callback
             
             # Create the callback
-            callback = create_callback(trigger_id, component_config, action_components)
+            callback = create_callback(trigger_id, action_levels)
             
             # Create component instance and event ONCE
             component = self._create_component_instance(trigger_id, component_config)
             resolved_config = self.context.resolve_config(component_config.get('config', {}))
-            
-            from .factory import EventFactory
             event = EventFactory.create(component_config['event_type'], component, resolved_config)
             
             # Set the callback on the event
@@ -314,6 +447,7 @@ class Workflow:
             
             # Execute the event to start listening
             result = event.execute(self.context)
+            self._persistent_events[trigger_id] = event
             
             if not result.get('success', False):
                 return {